@@ -1,30 +1,189 @@
-import dateutil.parser
 from tqdm import tqdm
 import numpy as np
 import pandas as pd
 import concurrent.futures as cf
+import xml.etree.ElementTree as ET
+import functools
+import operator
+import os
+import sys
+from datetime import datetime
 
 # CONSTANTS
+# Apple's Health Kit date format and date attributes
+date_format = '%Y-%m-%d %H:%M:%S %z'
+date_attributes = ('creationDate', 'startDate', 'endDate')
+# Records dataframe columns (xml attribute: column name)
+rec_columns = {'type': 'rec_type', 
+               'sourceName': 'source_name', 
+               'sourceVersion': 'source_version', 
+               'device': 'device', 
+               'unit': 'unit', 
+               'creationDate': 'creation_date', 
+               'startDate': 'start_date', 
+               'endDate': 'end_date', 
+               'value': 'value'}
+rec_categorical_columns = ['rec_type', 'source_name', 'source_version', 'device', 'unit']
 # tqdm kwargs
+# (records bars are updated every 10000 records at most, instead of checking 
+# the elapsed time for each record)
 rec_kwargs = {'bar_format': '{l_bar}{bar:10}{r_bar}{bar:-10b}', 
               'unit': 'rec', 
               'position': 0, 
-              'mininterval': 0.5}
+              'mininterval': 0.5, 
+              'miniters': 10000}
 wrk_kwargs = {'bar_format': '{l_bar}{bar:10}{r_bar}{bar:-10b}', 
               'unit': 'wrk', 
               'position': 0, 
               'mininterval': 0.5}
 
+def _parse_fixed_width_dates(date_strings):
+    """
+    Utility function used by parse_dates: convert Health Kit date strings 
+    (fixed width 'YYYY-MM-DD hh:mm:ss +hhmm') to datetimes with integer 
+    arithmetic on their bytes, column by column (no per-string Python work).
+    Return None if any string does not match the fixed width format.
+    """
+    
+    # One row of bytes for each string (one extra byte, that shall be zero, 
+    # detects longer strings)
+    try:
+        raw = np.asarray(date_strings, dtype='S26')
+    except UnicodeEncodeError:
+        return None
+    chars = raw.view(np.uint8).reshape(-1, 26)
+    digits = chars - np.uint8(ord('0'))
+    
+    # Check format (non-digit characters wrap around to values above 9)
+    digit_cols = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18, 21, 22, 23, 24]
+    if not ((digits[:, digit_cols] <= 9).all() 
+            and (chars[:, [4, 7]] == ord('-')).all() 
+            and (chars[:, [10, 19]] == ord(' ')).all() 
+            and (chars[:, [13, 16]] == ord(':')).all() 
+            and np.isin(chars[:, 20], [ord('+'), ord('-')]).all() 
+            and (chars[:, 25] == 0).all()):
+        return None
+    
+    # Numbers from digits columns
+    def number(*cols):
+        value = np.zeros(len(chars), dtype=np.int64)
+        for col in cols:
+            value = value * 10 + digits[:, col]
+        return value
+    year = number(0, 1, 2, 3)
+    month = number(5, 6)
+    day = number(8, 9)
+    hours, minutes, secs = number(11, 12), number(14, 15), number(17, 18)
+    offset_hours, offset_minutes = number(21, 22), number(23, 24)
+    # Check ranges, invalid dates are left to pandas (that raises an error)
+    # (years are limited to the range of int64 nanoseconds timestamps)
+    leap = ((year % 4 == 0) & (year % 100 != 0)) | (year % 400 == 0)
+    days_in_month = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])[np.clip(month, 0, 12)]
+    days_in_month = days_in_month + (leap & (month == 2))
+    if not ((year > 1677) & (year < 2262) & (month >= 1) & (month <= 12) 
+            & (day >= 1) & (day <= days_in_month) 
+            & (hours < 24) & (minutes < 60) & (secs < 60) 
+            & (offset_hours < 24) & (offset_minutes < 60)).all():
+        return None
+    seconds = hours * 3600 + minutes * 60 + secs
+    offset = offset_hours * 3600 + offset_minutes * 60
+    offset = np.where(chars[:, 20] == ord('-'), -offset, offset)
+    
+    # Days since epoch (Howard Hinnant's days_from_civil algorithm)
+    y = year - (month <= 2)
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    days = era * 146097 + doe - 719468
+    
+    # Nanoseconds since epoch (UTC)
+    dates_ns = (days * 86400 + seconds - offset) * 1_000_000_000
+    dates = pd.DatetimeIndex(dates_ns.view('datetime64[ns]'), tz='UTC')
+    return dates
+
+def parse_dates(date_strings):
+    """
+    Vectorized conversion of Health Kit date strings to datetimes.
+
+    Parameters
+    ----------
+    date_strings : list-like of strings
+        dates with Apple's Health Kit format (e.g. '2021-04-24 18:12:42 +0200').
+
+    Returns
+    -------
+    dates : pandas.DatetimeIndex
+        UTC datetimes with nanoseconds resolution (offsets changes due to 
+        daylight saving time prevent the use of a single time zone).
+
+    """
+    
+    # Fixed width strings are parsed directly from their bytes
+    dates = _parse_fixed_width_dates(date_strings)
+    if dates is not None:
+        return dates
+    # Otherwise (e.g. missing dates) fall back to pandas: fixed format skips 
+    # format inference, cache avoids parsing the same string twice
+    # Timestamps are stored as int64 nanoseconds since epoch
+    dates = pd.to_datetime(date_strings, format=date_format, cache=True, utc=True).astype('datetime64[ns, UTC]')
+    return dates
+
+@functools.lru_cache(maxsize=65536)
+def parse_date(date_string, _strptime=datetime.strptime, _format=date_format):
+    """
+    Convert a single Health Kit date string to datetime.
+    Used when building objects one by one, results are cached since many 
+    records share the same timestamps.
+
+    Parameters
+    ----------
+    date_string : string
+        date with Apple's Health Kit format (e.g. '2021-04-24 18:12:42 +0200').
+
+    Returns
+    -------
+    date : pandas.Timestamp
+        UTC datetime, as returned by parse_dates (NaT if date_string is None).
+
+    """
+    
+    if date_string is None:
+        return pd.NaT
+    # Nanoseconds resolution, as for timestamps from parse_dates
+    date = pd.Timestamp(_strptime(date_string, _format)).tz_convert('UTC').as_unit('ns')
+    return date
+
+def _set_slots_state(obj, state):
+    """
+    __setstate__ shared by health kit classes: unpickle objects saved before 
+    the introduction of __slots__ (state is the instance dict) as well as 
+    slotted ones (state is a (None, slots dict) tuple).
+    """
+    
+    if isinstance(state, tuple):
+        state = state[1]
+    for name, value in state.items():
+        setattr(obj, name, value)
+
 class HKRecord:
     
-    def __init__(self, xml_element):
+    # Fixed attributes (no per-instance __dict__)
+    __slots__ = ('rec_type', 'source_name', 'source_version', 'device', 'unit', 
+                 'creation_date', 'start_date', 'end_date', 'value')
+    
+    def __init__(self, xml_element, dates=None):
         """
         Health Kit Record object.
 
         Parameters
         ----------
-        xml_element : ElementTree child
-            ElementTree child for Apple's Health Kit Workout tag.
+        xml_element : ElementTree child or dict
+            ElementTree child for Apple's Health Kit Workout tag (or its 
+            attributes dict).
+        dates : tuple of datetime, optional
+            creation, start and end dates already parsed from xml_element.
+            The default is None (dates are parsed from xml_element).
 
         Returns
         -------
@@ -32,14 +191,18 @@ class HKRecord:
 
         """
         
-        self.rec_type = xml_element.get('type')
-        self.source_name = xml_element.get('sourceName')
+        # Types and sources are shared by many records: intern them so that 
+        # equal strings are the same object (only for records built from xml 
+        # elements, e.g. by load_xml_tag; loaders return a dataframe, whose 
+        # categorical columns already share them, see from_dataframe)
+        self.rec_type = sys.intern(xml_element.get('type'))
+        self.source_name = sys.intern(xml_element.get('sourceName'))
         self.source_version = xml_element.get('sourceVersion')
         self.device = xml_element.get('device')
         self.unit = xml_element.get('unit')
-        self.creation_date = dateutil.parser.parse(xml_element.attrib['creationDate'])
-        self.start_date = dateutil.parser.parse(xml_element.attrib['startDate'])
-        self.end_date = dateutil.parser.parse(xml_element.attrib['endDate'])
+        if dates is None:
+            dates = [parse_date(xml_element.get(attr)) for attr in date_attributes]
+        self.creation_date, self.start_date, self.end_date = dates
         
         # If unit is non then is a categorical value, otherwise convert to float
         if self.unit is None:
@@ -47,6 +210,47 @@ class HKRecord:
         else:
             self.value = float(xml_element.get('value'))
         
+    @classmethod
+    def from_dataframe(cls, records):
+        """
+        Create Health Kit Record objects from rows of a records dataframe.
+
+        Parameters
+        ----------
+        records : pandas.DataFrame
+            records dataframe (or a slice of it) as given by load_records.
+
+        Returns
+        -------
+        record_list : list
+            list of records (HKRecord), one for each row of the dataframe.
+
+        """
+        
+        # Use None for missing values, as for records read from xml
+        records = records.astype(object).where(records.notna(), None)
+        record_list = []
+        for row in records.itertuples(index=False):
+            record = cls.__new__(cls)
+            record.rec_type = row.rec_type
+            record.source_name = row.source_name
+            record.source_version = row.source_version
+            record.device = row.device
+            record.unit = row.unit
+            record.creation_date = row.creation_date
+            record.start_date = row.start_date
+            record.end_date = row.end_date
+            # If unit is none then is a categorical value, otherwise a float
+            if row.unit is None:
+                record.value = row.category_value
+            else:
+                record.value = float(row.value)
+            record_list.append(record)
+        return record_list
+        
+    # Also accept pickles saved before the introduction of __slots__
+    __setstate__ = _set_slots_state
+        
     def __repr__(self):
         return f'<HKRecord - type: {self.rec_type}, src: {self.source_name}, created: {self.creation_date}>'
 
@@ -61,6 +265,7 @@ class HKRecord:
             Value: {self.value:.3f} {self.unit}\n
             '''
         else:
+            ret_str = \
             f'''
             RECORD - {self.creation_date}\n
             {self.rec_type} from {self.source_name}\n
@@ -72,14 +277,23 @@ class HKRecord:
 
 class HKWorkout:
     
-    def __init__(self, xml_element):
+    # Fixed attributes (no per-instance __dict__)
+    __slots__ = ('activity_type', 'duration', 'duration_unit', 'total_distance', 
+                 'total_distance_unit', 'total_energy_burned', 'total_energy_burned_unit', 
+                 'source_name', 'source_version', 'device', 'creation_date', 'start_date', 'end_date')
+    
+    def __init__(self, xml_element, dates=None):
         """
         Health Kit Workout object.
 
         Parameters
         ----------
-        xml_element : ElementTree child
-            ElementTree child for Apple's Health Kit Workout tag.
+        xml_element : ElementTree child or dict
+            ElementTree child for Apple's Health Kit Workout tag (or its 
+            attributes dict).
+        dates : tuple of datetime, optional
+            creation, start and end dates already parsed from xml_element.
+            The default is None (dates are parsed from xml_element).
 
         Returns
         -------
@@ -97,9 +311,12 @@ class HKWorkout:
         self.source_name = xml_element.get('sourceName')
         self.source_version = xml_element.get('sourceVersion')
         self.device = xml_element.get('device')
-        self.creation_date = dateutil.parser.parse(xml_element.attrib['creationDate'])
-        self.start_date = dateutil.parser.parse(xml_element.attrib['startDate'])
-        self.end_date = dateutil.parser.parse(xml_element.attrib['endDate'])
+        if dates is None:
+            dates = [parse_date(xml_element.get(attr)) for attr in date_attributes]
+        self.creation_date, self.start_date, self.end_date = dates
+        
+    # Also accept pickles saved before the introduction of __slots__
+    __setstate__ = _set_slots_state
         
     def __repr__(self):
         return f'<HKWorkout - type: {self.activity_type}, src: {self.source_name}, created: {self.creation_date}>'
@@ -117,22 +334,133 @@ class HKWorkout:
         '''
         return ret_str
     
+def iter_xml_tags(xml_root, selected_tags):
+    """
+    Iterate over the attributes of the selected tags (only tags that are 
+    direct children of the xml root, as in ElementTree findall), in a single 
+    pass over the xml.
+    If a path is given the file is streamed: each child of the root is 
+    dropped as soon as it has been read, so the tree is never fully loaded.
+
+    Parameters
+    ----------
+    xml_root : ElementTree root or string
+        ElementTree (or lxml.etree) root for the xml element, or path to the 
+        xml file.
+    selected_tags : collection of strings
+        Tag names.
+
+    Yields
+    ------
+    tag : string
+        tag name.
+    attributes : dict
+        attributes of the tag.
+
+    """
+    
+    # ElementTree root: the tree is already in memory
+    # (lxml roots are accepted too, their attributes are a view on the 
+    # element and are copied to a dict)
+    if hasattr(xml_root, 'iterfind'):
+        for elem in xml_root.iterfind('*'):
+            if elem.tag in selected_tags:
+                attributes = elem.attrib
+                yield elem.tag, attributes if isinstance(attributes, dict) else dict(attributes)
+        return
+    
+    # Path: stream the file keeping track of the depth of each tag
+    depth = 0
+    for event, elem in ET.iterparse(xml_root, events=('start', 'end')):
+        if event == 'start':
+            if depth == 0:
+                root = elem
+            depth += 1
+            continue
+        depth -= 1
+        if depth == 1:
+            if elem.tag in selected_tags:
+                yield elem.tag, elem.attrib
+            # Release children of the root already read (the attributes 
+            # dict yielded above is kept alive by its consumer)
+            root.clear()
+
+def iter_xml_tag(xml_root, selected_tag):
+    """
+    Iterate over the attributes of the selected tag (see iter_xml_tags).
+
+    Parameters
+    ----------
+    xml_root : ElementTree root or string
+        ElementTree root for the xml element, or path to the xml file.
+    selected_tag : string
+        Tag name.
+
+    Returns
+    -------
+    attributes : iterator
+        iterator over attributes dicts of the selected tag.
+
+    """
+    
+    # Drop tag names with a C level map, instead of a Python generator frame 
+    # resumed for each tag
+    attributes = map(operator.itemgetter(1), iter_xml_tags(xml_root, (selected_tag,)))
+    return attributes
+
+def _objects_from_rows(rows, output_class, tqdm_kwargs={'unit': 'it'}):
+    """
+    Utility function used by load_xml_tag and load_all to convert attributes 
+    dicts (rows) of xml tags to health kit objects (HKRecord, HKWorkout).
+    """
+    
+    # Parse dates column by column (one vectorized call for each attribute)
+    dates = zip(*[parse_dates([row.get(attr) for row in rows]) for attr in date_attributes])
+    # Convert attributes rows to Python class (progress bar redrawn about 200 
+    # times at most)
+    tqdm_kwargs = {'miniters': max(1, len(rows) // 200), **tqdm_kwargs}
+    tags_object = [output_class(row, dates=row_dates) 
+                   for row, row_dates in tqdm(zip(rows, dates), postfix='Convert ' + output_class.__name__, 
+                                              total=len(rows), **tqdm_kwargs)]
+    return tags_object
+
+def _records_from_rows(rows):
+    """
+    Utility function used by load_records and load_all to convert attributes 
+    dicts (rows) of Record tags to the records dataframe.
+    """
+    
+    # Build the dataframe from attributes dicts (missing attributes are set 
+    # to NaN)
+    records = pd.DataFrame(rows, columns=list(rec_columns)).rename(columns=rec_columns)
+    # Strings repeated across records are stored as categories
+    records[rec_categorical_columns] = records[rec_categorical_columns].astype('category')
+    # Dates
+    for col in ('creation_date', 'start_date', 'end_date'):
+        records[col] = parse_dates(records[col])
+    # If unit is none then is a categorical value, otherwise convert to float
+    is_categorical = records['unit'].isna()
+    records['category_value'] = records['value'].where(is_categorical).astype('category')
+    records['value'] = pd.to_numeric(records['value'].where(~is_categorical))
+    return records
+
 def load_xml_tag(xml_root, selected_tag, output_class, n_threads=None, tqdm_kwargs={'unit': 'it'}):
     """
     Utility function used by health kit classes to load data from xml tags.
+    Attributes are read in a single sequential pass over the xml tags: object 
+    construction is GIL-bound, so threads would only add overhead.
 
     Parameters
     ----------
-    xml_root : ElementTree root
-        ElementTree root for the xml element.
+    xml_root : ElementTree root or string
+        ElementTree root for the xml element, or path to the xml file 
+        (streamed, see iter_xml_tag).
     selected_tag : string
-        Tag name, used by ElementTree findall to search for the selcted tag.
+        Tag name, used by iter_xml_tag to search for the selcted tag.
     output_class : health kit class (HKRecord, HKWorkout)
         class used for creating the output list.
     n_threads : int, optional
-        Number of thread used by concurrent.futures to run multiple threads 
-        for loading the xml. The default is None (use default number of 
-        threads).
+        Not used, kept for backward compatibility. The default is None.
     tqdm_kwargs : dict, optional
         dict with tqdm kwargs. The default is {'unit': 'it'}.
 
@@ -144,54 +472,53 @@ def load_xml_tag(xml_root, selected_tag, output_class, n_threads=None, tqdm_kwar
 
     """
     
-    # Convert tags to Python class
-    with cf.ThreadPoolExecutor(max_workers=n_threads) as executor:
-        future_tags = [executor.submit(lambda x: output_class(x), tag) 
-                        for tag in tqdm(xml_root.findall(selected_tag), 
-                                        postfix='Submit jobs for ' + selected_tag, **tqdm_kwargs)]
-        for f in tqdm(cf.as_completed(future_tags), postfix='Convert ' + selected_tag, 
-                      total=len(future_tags), **tqdm_kwargs):
-            pass
+    # Collect the attributes dict of each tag (no copy, ElementTree already 
+    # stores them as dict)
+    rows = list(iter_xml_tag(xml_root, selected_tag))
     # Return results
-    tags_object = [f.result() for f in future_tags]
+    tags_object = _objects_from_rows(rows, output_class, tqdm_kwargs=tqdm_kwargs)
     return tags_object
 
 def load_records(xml_root, n_threads=None):
     """
-    Load Record tags from xml root.
+    Load Record tags from xml into a dataframe (one column for each 
+    attribute, one row for each record).
 
     Parameters
     ----------
-    xml_root : ElementTree root
-        ElementTree root for the xml element.
+    xml_root : ElementTree root or string
+        ElementTree root for the xml element, or path to the xml file 
+        (streamed, see iter_xml_tag).
     n_threads : int, optional
-        Number of thread used by concurrent.futures to run multiple threads 
-        for loading the xml. The default is None (use default number of 
-        threads).
+        Not used, kept for backward compatibility. The default is None.
 
     Returns
     -------
-    records : list
-        list of records (HKRecord) described into the xml.
+    records : pandas.DataFrame
+        records described into the xml, with columns: rec_type, source_name, 
+        source_version, device, unit, creation_date, start_date, end_date, 
+        value (float, NaN for categorical records) and category_value 
+        (NaN for non-categorical records).
+        Use HKRecord.from_dataframe to get HKRecord objects.
 
     """
     
-    # Return list of records
-    records = load_xml_tag(xml_root, 'Record', HKRecord, n_threads=n_threads, tqdm_kwargs=rec_kwargs)
+    # Collect the attributes dict of each tag and build the dataframe
+    rows = list(tqdm(iter_xml_tag(xml_root, 'Record'), postfix='Load Record', **rec_kwargs))
+    records = _records_from_rows(rows)
     return records
 
 def load_workouts(xml_root, n_threads=None):
     """
-    Load Workout tags from xml root.
+    Load Workout tags from xml.
 
     Parameters
     ----------
-    xml_root : ElementTree root
-        ElementTree root for the xml element.
+    xml_root : ElementTree root or string
+        ElementTree root for the xml element, or path to the xml file 
+        (streamed, see iter_xml_tag).
     n_threads : int, optional
-        Number of thread used by concurrent.futures to run multiple threads 
-        for loading the xml. The default is None (use default number of 
-        threads).
+        Not used, kept for backward compatibility. The default is None.
 
     Returns
     -------
@@ -204,6 +531,141 @@ def load_workouts(xml_root, n_threads=None):
     workouts = load_xml_tag(xml_root, 'Workout', HKWorkout, n_threads=n_threads, tqdm_kwargs=wrk_kwargs)
     return workouts
 
+def load_all(xml_root, n_threads=None):
+    """
+    Load Record and Workout tags with a single pass over the xml (faster 
+    than calling load_records and load_workouts).
+
+    Parameters
+    ----------
+    xml_root : ElementTree root or string
+        ElementTree root for the xml element, or path to the xml file 
+        (streamed, see iter_xml_tag).
+    n_threads : int, optional
+        Not used, kept for consistency with load_records and load_workouts. 
+        The default is None.
+
+    Returns
+    -------
+    records : pandas.DataFrame
+        records described into the xml (see load_records).
+    workouts : list
+        list of workouts (HKWorkout) described into the xml.
+
+    """
+    
+    # Dispatch the attributes dict of each tag to its rows list
+    rows = {'Record': [], 'Workout': []}
+    for tag, attributes in tqdm(iter_xml_tags(xml_root, rows), postfix='Load Record and Workout', **rec_kwargs):
+        rows[tag].append(attributes)
+    # Return results
+    records = _records_from_rows(rows['Record'])
+    workouts = _objects_from_rows(rows['Workout'], HKWorkout, tqdm_kwargs=wrk_kwargs)
+    return records, workouts
+
+def _pack_timeseries_data(key, records_of_type, ts_source=None):
+    """
+    Utility function used by build_single_workout_timeseries and 
+    build_workouts_timeseries to pack the data needed by the timeseries of a 
+    record type into typed arrays.
+
+    Parameters
+    ----------
+    key : string
+        record type.
+    records_of_type : pandas.DataFrame
+        records of the selected type sorted by start date.
+    ts_source : list of strings, optional
+        see build_single_workout_timeseries. The default is None.
+
+    Returns
+    -------
+    dates : pandas.DatetimeIndex
+        start dates of records (int64 nanoseconds since epoch).
+    values : numpy.ndarray
+        values of records: float32 for numeric types, object for categorical 
+        types.
+    selected : numpy.ndarray or None
+        boolean mask of records from ts_source (None if ts_source is None).
+
+    """
+    
+    dates = pd.DatetimeIndex(records_of_type['start_date'].array)
+    # If not categorical use float
+    if 'category' not in key.lower():
+        values = records_of_type['value'].to_numpy(dtype=np.float32)
+    else:
+        values = records_of_type['category_value'].to_numpy(dtype=object, na_value=None)
+    # Flag records from the selected sources
+    if ts_source is not None:
+        selected = records_of_type['source_name'].isin(ts_source).to_numpy()
+    else:
+        selected = None
+    return dates, values, selected
+
+def _group_workout_data(workout, records_of_types, rem_duplicates=True):
+    """
+    Utility function used by build_single_workout_timeseries and 
+    build_workouts_timeseries to group records, timeseries and units of 
+    measurement of a workout based on types.
+
+    Parameters
+    ----------
+    workout : healthkit.HKWorkout
+        single workout (HKWorkout).
+    records_of_types : iterable
+        (record type, records dataframe, timeseries data) tuples, each 
+        dataframe holds the workout's records of a single type sorted by 
+        start date, timeseries data are the matching packed arrays as given 
+        by _pack_timeseries_data.
+    rem_duplicates : bool, optional
+        see build_single_workout_timeseries. The default is True.
+
+    Returns
+    -------
+    workout_data : dict
+        see build_single_workout_timeseries.
+
+    """
+    
+    records_by_type = {}
+    ts_by_type = {}
+    units = {}
+    for key, records_of_type, (dates, values, selected) in records_of_types:
+        # RECORDS
+        # Create a dict of records for the selected type
+        records_by_type[key] = HKRecord.from_dataframe(records_of_type)
+        
+        # UNITS
+        # Assign unit to unit dict
+        units[key] = records_by_type[key][0].unit
+        
+        # TIMESERIES
+        # Collect data from one single source if requested
+        if selected is not None:
+            dates = dates[selected]
+            values = values[selected]
+        # If there is no record that match the source condition jump to next 
+        # iteration since there is nothing to add
+        if len(dates) == 0:
+            continue
+        # Since different sources may store the same infromation twice keep only non-duplicated timestamps
+        # Both records are kept in 'records' anyway
+        # Records are sorted by date, so duplicated timestamps are adjacent 
+        # and can be found comparing each timestamp with the previous one
+        if rem_duplicates:
+            dates_ns = dates.asi8
+            keep = np.empty(len(dates_ns), dtype=bool)
+            keep[0] = True
+            np.not_equal(dates_ns[1:], dates_ns[:-1], out=keep[1:])
+            values = values[keep]
+            dates = dates[keep]
+        # Convert to timeseries (packed arrays are used without copies)
+        ts_by_type[key] = pd.Series(values, index=dates, name=key, copy=False)
+    
+    # Return results
+    workout_data = {'workout': workout, 'records': records_by_type, 'timeseries': ts_by_type, 'units': units}
+    return workout_data
 
 def build_single_workout_timeseries(workout, records, rem_duplicates=True, ts_source=None):
     """
@@ -216,8 +678,8 @@ def build_single_workout_timeseries(workout, records, rem_duplicates=True, ts_so
     workout : healthkit.HKWorkout
         single workout (HKWorkout) from workouts list as given by 
         load_workouts function.
-    records : list
-        list of records (HKRecord) as given by load_records function.
+    records : pandas.DataFrame
+        records dataframe as given by load_records function.
     rem_duplicates : bool, optional
         remove duplicated timestampes from timeseries if set to True.
         Duplicated records are not removed from dict 'records' keyword.
@@ -244,60 +706,57 @@ def build_single_workout_timeseries(workout, records, rem_duplicates=True, ts_so
     """
     
     # Timesreies source (ts_source) shall be a list
-    if not isinstance(ts_source, list):
+    if (ts_source is not None) and not isinstance(ts_source, list):
         raise TypeError('ts_source shall be a list')
     
     # Find records that belong to a certain workout (based on date) and sort them by date
     s_date = workout.start_date
     e_date = workout.end_date
-    records_of_workout = sorted([r for r in records if (s_date <= r.start_date <= e_date)], key=lambda x: x.start_date.isoformat())
+    records_of_workout = records[(records['start_date'] >= s_date) & (records['start_date'] <= e_date)]
+    records_of_workout = records_of_workout.sort_values('start_date', kind='stable')
     
-    # Find all unique records type (which are keys for the output dict)
-    keys = set([r.rec_type for r in records_of_workout])
+    # Group records, timeseries and units of measurement based on types 
+    # (a single pass over records, each key of the output dicts is a type)
+    groups = records_of_workout.groupby('rec_type', sort=False, observed=True).indices
+    records_of_types = []
+    for key, idx in groups.items():
+        records_of_type = records_of_workout.iloc[idx]
+        records_of_types.append((key, records_of_type, _pack_timeseries_data(key, records_of_type, ts_source=ts_source)))
+    workout_data = _group_workout_data(workout, records_of_types, rem_duplicates=rem_duplicates)
+    return workout_data
+
+# Records dataframes and timeseries data (one for each type) shared with 
+# worker processes (see _init_worker)
+_worker_records = None
+
+def _init_worker(records_by_type):
+    """
+    Initializer for worker processes: store records dataframes and 
+    timeseries data once for each process instead of pickling them with 
+    every job.
+    """
     
-    # Group records, timeseries and units of measurement based on types
-    records_by_type = {}
-    ts_by_type = {}
-    units = {}
-    for key in keys:
-        # RECORDS
-        # Create a dict of records for the selected type
-        records_by_type[key] = [r for r in records_of_workout if (key in r.rec_type)]
-        
-        # UNITS
-        # Assign unit to unit dict
-        units[key] = records_by_type[key][0].unit
-        
-        # TIMESERIES
-        # Create an array for timseries, each row is a timestamp-value couple 
-        # and collect data from one single source if requested
-        if ts_source is not None:
-            ts_array = np.array([[r.start_date, r.value] for r in records_of_workout 
-                                 if (key in r.rec_type) and (r.source_name in ts_source)])
-        else:
-            ts_array = np.array([[r.start_date, r.value] for r in records_of_workout 
-                                 if (key in r.rec_type)])
-        # If the array is empty there is no record that match the source condition
-        # Jump to next iteration since there is nothing to add
-        if ts_array.size == 0:
-            continue        
-        # Otherwise select the appropriate data type for timeseries (if not categorical convert to float)
-        if 'category' not in key.lower():
-            data_type = float
-        else:
-            data_type = None
-        # Convert to timeseries
-        ts = pd.Series(ts_array[:,1].ravel(), index=ts_array[:,0].ravel(), name=key, dtype=data_type)
-        # Since different sources may store the same infromation twice keep only non-duplicated timestamps
-        # Both records are kept in 'records' anyway
-        if rem_duplicates:
-            ts_by_type[key] = ts[~ts.index.duplicated()]
-        else:
-            ts_by_type[key] = ts
+    global _worker_records
+    _worker_records = records_by_type
+
+def _build_workout_window(window, records_by_type=None, rem_duplicates=True):
+    """
+    Worker function: group data for a workout given as a 
+    (workout, [(type, lo, hi), ...]) tuple where lo and hi are the bounds of 
+    the workout's slice of the (sorted) records of each type.
+    Records are taken from records_by_type, or from the ones stored by 
+    _init_worker if it is None.
+    """
     
-    # Return results
-    workout_data = {'workout': workout, 'records': records_by_type, 'timeseries': ts_by_type, 'units': units}
-    return workout_data
+    if records_by_type is None:
+        records_by_type = _worker_records
+    workout, type_windows = window
+    records_of_types = []
+    for key, lo, hi in type_windows:
+        records_of_type, (dates, values, selected) = records_by_type[key]
+        ts_data = (dates[lo:hi], values[lo:hi], None if selected is None else selected[lo:hi])
+        records_of_types.append((key, records_of_type.iloc[lo:hi], ts_data))
+    return _group_workout_data(workout, records_of_types, rem_duplicates=rem_duplicates)
 
 def build_workouts_timeseries(workouts, records, n_threads=None, rem_duplicates=True, ts_source=None):
     """
@@ -310,12 +769,13 @@ def build_workouts_timeseries(workouts, records, n_threads=None, rem_duplicates=
     ----------
     workouts : list
         list of workouts (HKWorkout) as given by load_workouts.
-    records : list
-        list of records (HKRecord) as given by load_records function.
+    records : pandas.DataFrame
+        records dataframe as given by load_records function.
     n_threads : int, optional
-        Number of thread used by concurrent.futures to run multiple threads 
-        for processing data. The default is None (use default number of 
-        threads).
+        Number of worker processes used by concurrent.futures for processing 
+        data (capped to the number of processors, since the work is CPU 
+        bound). With a single process workouts are built in the current 
+        process. The default is None (use the number of processors).
     rem_duplicates : bool, optional
         remove duplicated timestampes from timeseries if set to True.
         Duplicated records are not removed from dict 'records' keyword.
@@ -342,17 +802,59 @@ def build_workouts_timeseries(workouts, records, n_threads=None, rem_duplicates=
 
     """
     
-    # Initiate collecting variable
-    workouts_data = []
+    # Timesreies source (ts_source) shall be a list
+    if (ts_source is not None) and not isinstance(ts_source, list):
+        raise TypeError('ts_source shall be a list')
+    
+    # Index records by type once: a dataframe sorted by start date for each 
+    # type, so that records of each workout are found with a binary search 
+    # (instead of scanning and grouping all records for every workout)
+    records = records.sort_values('start_date', kind='stable')
+    records_by_type = {key: records.iloc[idx] 
+                       for key, idx in records.groupby('rec_type', sort=False, observed=True).indices.items()}
+    
+    # Timeseries data of each type are packed once into typed arrays: int64 
+    # timestamps, float32 values (object for categorical types) and the 
+    # ts_source mask
+    records_by_type = {key: (records_of_type, _pack_timeseries_data(key, records_of_type, ts_source=ts_source)) 
+                       for key, records_of_type in records_by_type.items()}
+    
+    # Records slice of each workout for every type, all bounds of a type are 
+    # found with one vectorized binary search on int64 timestamps
+    workouts_start = pd.DatetimeIndex([w.start_date for w in workouts], tz='UTC')
+    workouts_end = pd.DatetimeIndex([w.end_date for w in workouts], tz='UTC')
+    type_windows = [[] for _ in workouts]
+    for key, (_, (dates, _, _)) in records_by_type.items():
+        lo = dates.searchsorted(workouts_start, side='left')
+        hi = dates.searchsorted(workouts_end, side='right')
+        for n in np.flatnonzero(hi > lo):
+            type_windows[n].append((key, int(lo[n]), int(hi[n])))
+    windows = list(zip(workouts, type_windows))
+    
+    cpu = os.cpu_count() or 1
+    n_processes = min(n_threads or cpu, cpu)
+    # A single process builds workouts in the current process (a pool would 
+    # only add the cost of pickling results)
+    if n_processes == 1:
+        build_window = functools.partial(_build_workout_window, records_by_type=records_by_type, rem_duplicates=rem_duplicates)
+        workouts_data = list(tqdm(map(build_window, windows), 
+                                  postfix='Build timeseries for each workout', total=len(windows), **wrk_kwargs))
+        return workouts_data
     
-    # Multi-threads for assigning records to workouts
-    with cf.ThreadPoolExecutor(max_workers=n_threads) as executor:
-        future_data = [executor.submit(lambda x: build_single_workout_timeseries(x, records, rem_duplicates=rem_duplicates, ts_source=ts_source), workout) 
-                        for workout in tqdm(workouts, postfix='Submit jobs for building timeseries', **wrk_kwargs)]
-        for f in tqdm(cf.as_completed(future_data), postfix='Build timeseries for each workout', 
-                        total=len(future_data), **wrk_kwargs):
-            pass
+    # Multi-processes for assigning records to workouts (the work is pure 
+    # Python, threads would be serialized by the GIL)
+    # Records are sent once to each process by the initializer, only slices 
+    # are sent with each job (workouts stay here and are added back to the 
+    # results, so that each dict holds the caller's HKWorkout)
+    # Results are pickled back to this process, HKRecord lists included: 
+    # their transfer is serial and limits the speedup given by more processes
+    chunksize = max(1, len(windows) // (4 * n_processes))
+    build_window = functools.partial(_build_workout_window, rem_duplicates=rem_duplicates)
+    with cf.ProcessPoolExecutor(max_workers=n_processes, initializer=_init_worker, initargs=(records_by_type,)) as executor:
+        workouts_data = list(tqdm(executor.map(build_window, [(None, w) for w in type_windows], chunksize=chunksize), 
+                                  postfix='Build timeseries for each workout', total=len(windows), **wrk_kwargs))
+    for workout, workout_data in zip(workouts, workouts_data):
+        workout_data['workout'] = workout
         
     # Return results
-    workouts_data = [f.result() for f in future_data]
     return workouts_data
\ No newline at end of file